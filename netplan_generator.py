@@ -25,147 +25,375 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
-import argparse
+import io
+import json
+import re
 import sys
-import yaml
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Any
+
+# Ethernet keys in output order, interned once so every interface dict
+# shares the same key objects
+_ETH_KEYS = tuple(sys.intern(key) for key in (
+    "dhcp4", "dhcp6", "addresses", "gateway4", "gateway6", "nameservers",
+    "dhcp4-overrides", "dhcp6-overrides"))
+
+# (YAML key, add_* argument, always emitted) for each section, in output
+# order; dhcp4 is always set explicitly, other keys only when given
+_ETH_FIELDS = tuple(zip(
+    _ETH_KEYS,
+    ("dhcp4", "dhcp6", "addresses", "gateway4", "gateway6", "nameservers",
+     "dhcp4_overrides", "dhcp6_overrides"),
+    (True, False, False, False, False, False, False, False)))
+_SECTION_SPEC = {
+    "ethernets": _ETH_FIELDS,
+    "bonds": (("interfaces", "interfaces", True),
+              ("parameters", "parameters", True)) + _ETH_FIELDS[:6],
+    "bridges": (("interfaces", "interfaces", True),) + _ETH_FIELDS[:6],
+}
+
+_RENDERERS = frozenset({"networkd", "NetworkManager"})
+_VALID_BOND_MODES = frozenset({
+    "balance-rr", "active-backup", "balance-xor", "broadcast", "802.3ad",
+    "balance-tlb", "balance-alb"})
+
+# to_yaml output for a configuration with no interfaces, per renderer
+_EMPTY_YAML = {
+    renderer: f"network:\n  version: 2\n  renderer: {renderer}\n"
+    for renderer in _RENDERERS
+}
+
+# One key=value pair of a comma-separated overrides string. Matches only
+# start at a pair boundary and the key begins and ends on a non-space, so
+# malformed input is rejected in linear time; the value is stripped later
+_OVERRIDE_RE = re.compile(r"(?:^|(?<=,))\s*([^=,\s](?:[^=,]*[^=,\s])?)\s*=([^,]*)")
+# Override values converted to int; int() alone would also take "1_000"
+_INT_RE = re.compile(r"[-+]?\d+")
+
+# Whitespace dropped from comma-separated lists before splitting
+_WS_TABLE = str.maketrans("", "", " \t\r\n")
+
+# Longest key both PyYAML emitters write as "key:"; longer keys get the
+# explicit "? key" form (the pure-Python emitter counts the "!!str" tag)
+_MAX_SIMPLE_KEY = 122
+
+# Strings that PyYAML writes unquoted: a conservative character set ...
+_PLAIN_RE = re.compile(r"[A-Za-z0-9_/](?:[A-Za-z0-9_./:-]*[A-Za-z0-9_./-])?\Z")
+# ... minus those its resolver would read back as a bool, null, int, float
+# or timestamp, which it quotes
+_IMPLICIT_RE = re.compile(r"""
+    (?:yes|Yes|YES|no|No|NO|true|True|TRUE|false|False|FALSE|on|On|ON|off|Off|OFF
+      |null|Null|NULL
+      |[-+]?0b[0-1_]+|[-+]?0[0-7_]+|[-+]?(?:0|[1-9][0-9_]*)|[-+]?0x[0-9a-fA-F_]+
+      |[-+]?[1-9][0-9_]*(?::[0-5]?[0-9])+
+      |[-+]?[0-9][0-9_]*\.[0-9_]*(?:[eE][-+][0-9]+)?
+      |[-+]?[0-9][0-9_]*(?::[0-5]?[0-9])+\.[0-9_]*)\Z
+    |[0-9]{4}-[0-9]{1,2}-[0-9]{1,2}
+""", re.VERBOSE)
+
+
+class EthernetConfig(NamedTuple):
+    """Ethernet interface settings, mirroring NetplanGenerator.add_ethernet."""
+    name: str
+    dhcp4: bool = True
+    dhcp6: bool = False
+    addresses: Optional[List[str]] = None
+    gateway4: Optional[str] = None
+    gateway6: Optional[str] = None
+    nameservers: Optional[List[str]] = None
+    dhcp4_overrides: Optional[Dict[str, Any]] = None
+    dhcp6_overrides: Optional[Dict[str, Any]] = None
+
+
+class BondConfig(NamedTuple):
+    """Bond interface settings, mirroring NetplanGenerator.add_bond."""
+    name: str
+    interfaces: List[str]
+    mode: str = "active-backup"
+    dhcp4: bool = True
+    dhcp6: bool = False
+    addresses: Optional[List[str]] = None
+    gateway4: Optional[str] = None
+    gateway6: Optional[str] = None
+    nameservers: Optional[List[str]] = None
+
+
+class BridgeConfig(NamedTuple):
+    """Bridge interface settings, mirroring NetplanGenerator.add_bridge."""
+    name: str
+    interfaces: List[str]
+    dhcp4: bool = True
+    dhcp6: bool = False
+    addresses: Optional[List[str]] = None
+    gateway4: Optional[str] = None
+    gateway6: Optional[str] = None
+    nameservers: Optional[List[str]] = None
 
 
 class NetplanGenerator:
     """Main class for generating netplan configurations."""
     
+    # Skeleton every configuration starts from; copied, never mutated
+    _PROTO = {"network": {"version": 2, "renderer": "networkd"}}
+    
+    # PyYAML dumper class, resolved on the first to_yaml call
+    _dumper = None
+    
     def __init__(self, renderer="networkd"):
-        self.config = {
-            "network": {
-                "version": 2,
-                "renderer": renderer
-            }
+        self.config = {}
+        # Bumped on every change so to_yaml can reuse its last result
+        self._version = 0
+        self._yaml_cache = (None, None)
+        self.reset(renderer)
+    
+    def reset(self, renderer: Optional[str] = None) -> None:
+        """Remove all interfaces, keeping the current renderer by default."""
+        if renderer is None and "network" in self.config:
+            renderer = self.config["network"]["renderer"]
+        if renderer not in _RENDERERS:
+            raise ValueError(f"Unsupported renderer: {renderer}")
+        
+        net = self._PROTO["network"].copy()
+        net["renderer"] = renderer
+        self.config.clear()
+        self.config["network"] = net
+        self._version += 1
+    
+    @staticmethod
+    def _build(section: str, kw: Dict[str, Any]) -> Dict[str, Any]:
+        """Lay out one interface's settings for section per _SECTION_SPEC."""
+        if kw.get("nameservers"):
+            kw["nameservers"] = {"addresses": kw["nameservers"]}
+        if "mode" in kw:
+            kw["parameters"] = {"mode": kw.pop("mode")}
+        
+        return {
+            key: value for key, arg, always in _SECTION_SPEC[section]
+            if (value := kw.get(arg)) or always
         }
     
+    def _add(self, section: str, name: str, **kw: Any) -> None:
+        """Add an interface to section, laid out by _SECTION_SPEC."""
+        network = self.config["network"]
+        
+        # Add ethernet declarations for bond/bridge interfaces with dhcp4: false
+        members = kw.get("interfaces")
+        if members is not None:
+            ethernets = network.setdefault("ethernets", {})
+            for interface in members:
+                ethernets[interface] = {"dhcp4": False}
+        
+        network.setdefault(section, {})[name] = self._build(section, kw)
+        self._version += 1
+    
+    @classmethod
+    def from_specs(cls, ethernets: Sequence[EthernetConfig] = (),
+                   bonds: Sequence[BondConfig] = (),
+                   bridges: Sequence[BridgeConfig] = (),
+                   renderer: str = "networkd") -> "NetplanGenerator":
+        """Build a generator from interface specs in one pass.
+        
+        Gives the same configuration as calling add_ethernet, add_bond and
+        add_bridge for each spec in that order, but fills every section
+        directly instead of going through the add_* methods.
+        """
+        for spec in bonds:
+            if spec.mode not in _VALID_BOND_MODES:
+                raise ValueError(f"Unsupported bond mode: {spec.mode}")
+        
+        generator = cls(renderer)
+        network = generator.config["network"]
+        if not (ethernets or bonds or bridges):
+            return generator
+        
+        eth_section = {spec.name: cls._build("ethernets", spec._asdict())
+                       for spec in ethernets}
+        network["ethernets"] = eth_section
+        for section, specs in (("bonds", bonds), ("bridges", bridges)):
+            if not specs:
+                continue
+            section_config = network[section] = {}
+            for spec in specs:
+                for interface in spec.interfaces:
+                    eth_section[interface] = {"dhcp4": False}
+                section_config[spec.name] = cls._build(section, spec._asdict())
+        
+        generator._version += 1
+        return generator
+    
     def add_ethernet(self, name: str, dhcp4: bool = True, dhcp6: bool = False, 
                     addresses: List[str] = None, gateway4: str = None, 
                     gateway6: str = None, nameservers: List[str] = None,
                     dhcp4_overrides: Dict[str, Any] = None,
                     dhcp6_overrides: Dict[str, Any] = None) -> None:
         """Add ethernet interface configuration."""
-        if "ethernets" not in self.config["network"]:
-            self.config["network"]["ethernets"] = {}
-        
-        interface_config = {}
-        
-        # Always set dhcp4 explicitly
-        interface_config["dhcp4"] = dhcp4
-        if dhcp6:
-            interface_config["dhcp6"] = dhcp6
-            
-        if addresses:
-            interface_config["addresses"] = addresses
-            
-        if gateway4:
-            interface_config["gateway4"] = gateway4
-        if gateway6:
-            interface_config["gateway6"] = gateway6
-            
-        if nameservers:
-            interface_config["nameservers"] = {"addresses": nameservers}
-            
-        if dhcp4_overrides:
-            interface_config["dhcp4-overrides"] = dhcp4_overrides
-        if dhcp6_overrides:
-            interface_config["dhcp6-overrides"] = dhcp6_overrides
-            
-        self.config["network"]["ethernets"][name] = interface_config
+        self._add("ethernets", name, dhcp4=dhcp4, dhcp6=dhcp6,
+                  addresses=addresses, gateway4=gateway4, gateway6=gateway6,
+                  nameservers=nameservers, dhcp4_overrides=dhcp4_overrides,
+                  dhcp6_overrides=dhcp6_overrides)
     
     def add_bond(self, name: str, interfaces: List[str], mode: str = "active-backup",
                 dhcp4: bool = True, dhcp6: bool = False, addresses: List[str] = None,
                 gateway4: str = None, gateway6: str = None, 
                 nameservers: List[str] = None) -> None:
         """Add bond interface configuration."""
-        # Add ethernet declarations for bond interfaces with dhcp4: false
-        if "ethernets" not in self.config["network"]:
-            self.config["network"]["ethernets"] = {}
-        
-        for interface in interfaces:
-            self.config["network"]["ethernets"][interface] = {"dhcp4": False}
-        
-        if "bonds" not in self.config["network"]:
-            self.config["network"]["bonds"] = {}
-        
-        interface_config = {
-            "interfaces": interfaces,
-            "parameters": {"mode": mode}
-        }
-        
-        # Always set dhcp4 explicitly
-        interface_config["dhcp4"] = dhcp4
-        if dhcp6:
-            interface_config["dhcp6"] = dhcp6
-            
-        if addresses:
-            interface_config["addresses"] = addresses
-            
-        if gateway4:
-            interface_config["gateway4"] = gateway4
-        if gateway6:
-            interface_config["gateway6"] = gateway6
-            
-        if nameservers:
-            interface_config["nameservers"] = {"addresses": nameservers}
-            
-        self.config["network"]["bonds"][name] = interface_config
+        if mode not in _VALID_BOND_MODES:
+            raise ValueError(f"Unsupported bond mode: {mode}")
+        self._add("bonds", name, interfaces=interfaces, mode=mode, dhcp4=dhcp4,
+                  dhcp6=dhcp6, addresses=addresses, gateway4=gateway4,
+                  gateway6=gateway6, nameservers=nameservers)
     
     def add_bridge(self, name: str, interfaces: List[str], dhcp4: bool = True, 
                   dhcp6: bool = False, addresses: List[str] = None,
                   gateway4: str = None, gateway6: str = None, 
                   nameservers: List[str] = None) -> None:
         """Add bridge interface configuration."""
-        # Add ethernet declarations for bridge interfaces with dhcp4: false
-        if "ethernets" not in self.config["network"]:
-            self.config["network"]["ethernets"] = {}
+        self._add("bridges", name, interfaces=interfaces, dhcp4=dhcp4,
+                  dhcp6=dhcp6, addresses=addresses, gateway4=gateway4,
+                  gateway6=gateway6, nameservers=nameservers)
+    
+    def to_json(self) -> str:
+        """Convert configuration to JSON string, newline-terminated like to_yaml."""
+        return json.dumps(self.config, indent=2) + "\n"
+    
+    @classmethod
+    def _get_dumper(cls):
+        """Return the fastest available PyYAML safe dumper class."""
+        if cls._dumper is None:
+            try:
+                from yaml import CSafeDumper as dumper
+            except ImportError:
+                from yaml import SafeDumper as dumper
+            cls._dumper = dumper
+        return cls._dumper
+    
+    def _emit(self, stream, encoding: Optional[str] = None) -> None:
+        """Serialize the configuration into stream.
         
-        for interface in interfaces:
-            self.config["network"]["ethernets"][interface] = {"dhcp4": False}
+        Drives the dumper directly instead of going through yaml.dump.
+        PyYAML dumpers cannot be reopened once closed, so a new one is
+        built per call. With an encoding, bytes are written instead of str.
+        """
+        dumper = self._get_dumper()(stream, default_flow_style=False,
+                                    sort_keys=False, encoding=encoding)
+        try:
+            dumper.open()
+            dumper.represent(self.config)
+            dumper.close()
+        finally:
+            dumper.dispose()
+    
+    def _emit_fast(self) -> Optional[str]:
+        """Render the configuration without PyYAML.
         
-        if "bridges" not in self.config["network"]:
-            self.config["network"]["bridges"] = {}
+        Covers what NetplanGenerator itself produces (nested mappings,
+        lists of scalars, booleans, integers and plain strings) and gives
+        the same text as the dumper. Returns None for anything else,
+        including long keys and containers referenced more than once,
+        which the dumper writes as "? key" and &anchor/*alias.
+        """
+        lines = []
+        if not self.config or not _emit_mapping(self.config, "", lines, set()):
+            return None
+        return "".join(lines)
+    
+    def dump_to(self, stream, encoding: Optional[str] = None) -> None:
+        """Write the YAML configuration to stream.
         
-        interface_config = {
-            "interfaces": interfaces
-        }
+        stream is a text stream, or a binary one when encoding is given.
+        Configurations the built-in emitter cannot handle are serialized
+        straight into stream rather than built up as a string first.
+        """
+        if self._yaml_cache[0] != self._version:
+            result = self._emit_fast()
+            if result is None:
+                self._emit(stream, encoding)
+                return
+            self._yaml_cache = (self._version, result)
         
-        # Always set dhcp4 explicitly
-        interface_config["dhcp4"] = dhcp4
-        if dhcp6:
-            interface_config["dhcp6"] = dhcp6
-            
-        if addresses:
-            interface_config["addresses"] = addresses
-            
-        if gateway4:
-            interface_config["gateway4"] = gateway4
-        if gateway6:
-            interface_config["gateway6"] = gateway6
-            
-        if nameservers:
-            interface_config["nameservers"] = {"addresses": nameservers}
-            
-        self.config["network"]["bridges"][name] = interface_config
+        result = self._yaml_cache[1]
+        stream.write(result.encode(encoding) if encoding else result)
     
     def to_yaml(self) -> str:
-        """Convert configuration to YAML string."""
-        return yaml.dump(self.config, default_flow_style=False, sort_keys=False)
+        """Convert configuration to YAML string.
+        
+        The result is cached until the next add_* or reset call, so edit
+        the configuration through those methods rather than self.config.
+        """
+        if self._yaml_cache[0] == self._version:
+            return self._yaml_cache[1]
+        
+        network = self.config["network"]
+        if len(network) == 2:
+            result = _EMPTY_YAML.get(network["renderer"])
+            if result is not None:
+                return result
+        
+        result = self._emit_fast()
+        if result is None:
+            stream = io.StringIO()
+            self._emit(stream)
+            result = stream.getvalue()
+        self._yaml_cache = (self._version, result)
+        return result
+
+
+def _emit_scalar(value: Any) -> Optional[str]:
+    """Format a scalar the way the dumper would, or return None."""
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if type(value) is int:
+        return str(value)
+    if (type(value) is str and _PLAIN_RE.match(value)
+            and not _IMPLICIT_RE.match(value)):
+        return value
+    return None
+
+
+def _emit_mapping(mapping: Dict[str, Any], indent: str, lines: List[str],
+                  seen: Set[int]) -> bool:
+    """Append block-style YAML lines for mapping; False if unsupported.
+    
+    seen holds the ids of containers already emitted.
+    """
+    for key, value in mapping.items():
+        if _emit_scalar(key) != key or len(key) > _MAX_SIMPLE_KEY:
+            return False
+        
+        if type(value) is dict:
+            if not value or id(value) in seen:
+                return False
+            seen.add(id(value))
+            lines.append(f"{indent}{key}:\n")
+            if not _emit_mapping(value, indent + "  ", lines, seen):
+                return False
+        elif type(value) is list:
+            if not value or id(value) in seen:
+                return False
+            seen.add(id(value))
+            lines.append(f"{indent}{key}:\n")
+            for item in value:
+                scalar = _emit_scalar(item)
+                if scalar is None:
+                    return False
+                lines.append(f"{indent}- {scalar}\n")
+        else:
+            scalar = _emit_scalar(value)
+            if scalar is None:
+                return False
+            lines.append(f"{indent}{key}: {scalar}\n")
+    
+    return True
 
 
 def parse_list(value: str) -> List[str]:
     """Parse comma-separated values into a list."""
-    if not value:
-        return []
-    return [item.strip() for item in value.split(",")]
+    return value.translate(_WS_TABLE).split(",") if value else []
 
 
-def generate_networkmanager_config() -> str:
-    """Generate minimal NetworkManager configuration with comments."""
-    yaml_content = """# Netplan configuration for NetworkManager
+# Returned as-is by generate_networkmanager_config
+_NM_CONFIG_YAML = """# Netplan configuration for NetworkManager
 # This configuration sets NetworkManager as the network renderer
 # Use NetworkManager tools to configure network interfaces:
 #
@@ -194,33 +422,39 @@ network:
   version: 2
   renderer: NetworkManager
 """
-    return yaml_content
+
+
+def generate_networkmanager_config() -> str:
+    """Generate minimal NetworkManager configuration with comments."""
+    return _NM_CONFIG_YAML
+
+def _coerce_override(val: str) -> Any:
+    """Convert boolean and numeric override values."""
+    val = val.strip()
+    lowered = val.lower()
+    if lowered in ("true", "false"):
+        return lowered == "true"
+    if _INT_RE.fullmatch(val):
+        return int(val)
+    return val
+
 
 def parse_overrides(value: str) -> Dict[str, Any]:
     """Parse key=value pairs into a dictionary."""
     if not value:
         return {}
     
-    overrides = {}
-    for pair in value.split(","):
-        if "=" in pair:
-            key, val = pair.split("=", 1)
-            key = key.strip()
-            val = val.strip()
-            
-            # Convert boolean and numeric values
-            if val.lower() in ("true", "false"):
-                val = val.lower() == "true"
-            elif val.isdigit():
-                val = int(val)
-                
-            overrides[key] = val
-    
-    return overrides
+    return {m.group(1): _coerce_override(m.group(2))
+            for m in _OVERRIDE_RE.finditer(value)}
 
 
-def main():
-    """Main function."""
+def main(argv: Optional[List[str]] = None) -> None:
+    """Main function.
+    
+    argv defaults to sys.argv[1:], letting tests drive the CLI in-process.
+    """
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description="Generate netplan YAML configuration",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -243,16 +477,21 @@ Examples:
 
   # Output to file
   python netplan_generator.py --ethernet eth0 --output config.yaml
+
+  # JSON output for scripts
+  python netplan_generator.py --ethernet eth0 --format json
         """
     )
     
     # General options
     parser.add_argument("--output", "-o", help="Output file (default: stdout)")
     parser.add_argument("--renderer", default="networkd", 
-                       choices=["networkd", "NetworkManager"],
+                       choices=sorted(_RENDERERS),
                        help="Network renderer (default: networkd)")
     parser.add_argument("--use-nm", action="store_true",
                        help="Generate minimal NetworkManager configuration (ignores all other options)")
+    parser.add_argument("--format", default="yaml", choices=["yaml", "json"],
+                       help="Output format (default: yaml)")
     
     # Interface options
     parser.add_argument("--ethernet", help="Ethernet interface name")
@@ -272,14 +511,15 @@ Examples:
     # Bond/Bridge specific options
     parser.add_argument("--bond-interfaces", help="Comma-separated interfaces for bond (will be configured with dhcp4: false)")
     parser.add_argument("--bond-mode", default="active-backup",
+                       choices=sorted(_VALID_BOND_MODES),
                        help="Bond mode (default: active-backup)")
     parser.add_argument("--bridge-interfaces", help="Comma-separated interfaces for bridge (will be configured with dhcp4: false)")
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Handle --use-nm option (ignores all other parameters)
     if args.use_nm:
-        yaml_output = generate_networkmanager_config()
+        output = generate_networkmanager_config()
     else:
         # Validate arguments for normal operation
         if not any([args.ethernet, args.bond, args.bridge]):
@@ -287,80 +527,90 @@ Examples:
         
         generator = NetplanGenerator(args.renderer)
     
-    # Process ethernet interface
-    if args.ethernet:
-        addresses = parse_list(args.addresses) if args.addresses else None
-        nameservers = parse_list(args.nameservers) if args.nameservers else None
-        dhcp4_overrides = parse_overrides(args.dhcp4_overrides) if args.dhcp4_overrides else None
-        dhcp6_overrides = parse_overrides(args.dhcp6_overrides) if args.dhcp6_overrides else None
+        # Process ethernet interface
+        if args.ethernet:
+            addresses = parse_list(args.addresses) if args.addresses else None
+            nameservers = parse_list(args.nameservers) if args.nameservers else None
+            dhcp4_overrides = parse_overrides(args.dhcp4_overrides) if args.dhcp4_overrides else None
+            dhcp6_overrides = parse_overrides(args.dhcp6_overrides) if args.dhcp6_overrides else None
         
-        generator.add_ethernet(
-            name=args.ethernet,
-            dhcp4=not args.static,
-            dhcp6=False,
-            addresses=addresses,
-            gateway4=args.gateway4,
-            gateway6=args.gateway6,
-            nameservers=nameservers,
-            dhcp4_overrides=dhcp4_overrides,
-            dhcp6_overrides=dhcp6_overrides
-        )
+            generator.add_ethernet(
+                name=args.ethernet,
+                dhcp4=not args.static,
+                dhcp6=False,
+                addresses=addresses,
+                gateway4=args.gateway4,
+                gateway6=args.gateway6,
+                nameservers=nameservers,
+                dhcp4_overrides=dhcp4_overrides,
+                dhcp6_overrides=dhcp6_overrides
+            )
     
-    # Process bond interface
-    if args.bond:
-        if not args.bond_interfaces:
-            parser.error("--bond-interfaces is required when using --bond")
+        # Process bond interface
+        if args.bond:
+            if not args.bond_interfaces:
+                parser.error("--bond-interfaces is required when using --bond")
         
-        bond_interfaces = parse_list(args.bond_interfaces)
-        addresses = parse_list(args.addresses) if args.addresses else None
-        nameservers = parse_list(args.nameservers) if args.nameservers else None
+            bond_interfaces = parse_list(args.bond_interfaces)
+            addresses = parse_list(args.addresses) if args.addresses else None
+            nameservers = parse_list(args.nameservers) if args.nameservers else None
         
-        generator.add_bond(
-            name=args.bond,
-            interfaces=bond_interfaces,
-            mode=args.bond_mode,
-            dhcp4=not args.static,
-            dhcp6=False,
-            addresses=addresses,
-            gateway4=args.gateway4,
-            gateway6=args.gateway6,
-            nameservers=nameservers
-        )
+            generator.add_bond(
+                name=args.bond,
+                interfaces=bond_interfaces,
+                mode=args.bond_mode,
+                dhcp4=not args.static,
+                dhcp6=False,
+                addresses=addresses,
+                gateway4=args.gateway4,
+                gateway6=args.gateway6,
+                nameservers=nameservers
+            )
     
-    # Process bridge interface
-    if args.bridge:
-        if not args.bridge_interfaces:
-            parser.error("--bridge-interfaces is required when using --bridge")
+        # Process bridge interface
+        if args.bridge:
+            if not args.bridge_interfaces:
+                parser.error("--bridge-interfaces is required when using --bridge")
         
-        bridge_interfaces = parse_list(args.bridge_interfaces)
-        addresses = parse_list(args.addresses) if args.addresses else None
-        nameservers = parse_list(args.nameservers) if args.nameservers else None
+            bridge_interfaces = parse_list(args.bridge_interfaces)
+            addresses = parse_list(args.addresses) if args.addresses else None
+            nameservers = parse_list(args.nameservers) if args.nameservers else None
         
-        generator.add_bridge(
-            name=args.bridge,
-            interfaces=bridge_interfaces,
-            dhcp4=not args.static,
-            dhcp6=False,
-            addresses=addresses,
-            gateway4=args.gateway4,
-            gateway6=args.gateway6,
-            nameservers=nameservers
-        )
+            generator.add_bridge(
+                name=args.bridge,
+                interfaces=bridge_interfaces,
+                dhcp4=not args.static,
+                dhcp6=False,
+                addresses=addresses,
+                gateway4=args.gateway4,
+                gateway6=args.gateway6,
+                nameservers=nameservers
+            )
         
-        # Generate YAML output
-        yaml_output = generator.to_yaml()
+        # Generate output
+        if args.format == "json":
+            output = generator.to_json()
+        elif args.output:
+            # Streamed straight into the file below
+            output = None
+        else:
+            output = generator.to_yaml()
     
     # Output to file or stdout
     if args.output:
         try:
-            with open(args.output, 'w') as f:
-                f.write(yaml_output)
+            # Binary mode skips the text layer; encode exactly once here
+            with open(args.output, 'wb') as f:
+                if output is None:
+                    generator.dump_to(f, encoding="utf-8")
+                else:
+                    f.write(output.encode("utf-8"))
             print(f"Configuration written to {args.output}")
         except IOError as e:
             print(f"Error writing to file: {e}", file=sys.stderr)
             sys.exit(1)
     else:
-        print(yaml_output)
+        print(output)
 
 
 if __name__ == "__main__":
@@ -18,9 +18,11 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+import json
 import sys
 import yaml
-from netplan_generator import NetplanGenerator, EthernetConfig, BondConfig, BridgeConfig
+from netplan_generator import (NetplanGenerator, EthernetConfig, BondConfig, BridgeConfig,
+                               generate_networkmanager_config)
 
 def test_dhcp_ethernet():
     """Test DHCP ethernet configuration"""
@@ -136,6 +138,20 @@ def test_yaml_output():
     
     print("✓ YAML output test passed")
 
+def test_json_output():
+    """Test JSON output generation"""
+    print("Testing JSON output...")
+    generator = NetplanGenerator()
+    
+    generator.add_bond("bond0", interfaces=["eth0", "eth1"])
+    
+    json_output = generator.to_json()
+    
+    assert json.loads(json_output) == generator.config
+    assert json_output.endswith("}\n"), "JSON output should end with a newline"
+    
+    print("✓ JSON output test passed")
+
 def test_complex_config():
     """Test complex configuration with multiple interface types"""
     print("Testing complex configuration...")
@@ -177,6 +193,32 @@ def test_complex_config():
     
     print("✓ Complex configuration test passed")
 
+def test_from_specs():
+    """Test bulk construction from interface specs"""
+    print("Testing from_specs...")
+    ethernets = [
+        EthernetConfig("eth0", dhcp4=False, addresses=["192.168.1.100/24"],
+                       gateway4="192.168.1.1", nameservers=["8.8.8.8"]),
+    ]
+    bonds = [BondConfig("bond0", ["eth1", "eth2"], mode="802.3ad", dhcp4=False)]
+    bridges = [BridgeConfig("br0", ["eth3"])]
+    
+    generator = NetplanGenerator.from_specs(ethernets, bonds, bridges)
+    
+    # Must match adding the same interfaces one by one
+    expected = NetplanGenerator()
+    for spec in ethernets:
+        expected.add_ethernet(**spec._asdict())
+    for spec in bonds:
+        expected.add_bond(**spec._asdict())
+    for spec in bridges:
+        expected.add_bridge(**spec._asdict())
+    
+    assert generator.config == expected.config
+    assert generator.to_yaml() == expected.to_yaml()
+    
+    print("✓ from_specs test passed")
+
 def main():
     """Run all tests"""
     print("Running netplan generator tests...\n")
@@ -187,7 +229,9 @@ def main():
         test_bond()
         test_bridge()
         test_yaml_output()
+        test_json_output()
         test_complex_config()
+        test_from_specs()
         
         print("\n✓ All tests passed!")
         
@@ -199,8 +243,6 @@ def test_networkmanager_generation():
     """Test NetworkManager configuration generation"""
     print("Testing NetworkManager configuration generation...")
     
-    from netplan_generator import generate_networkmanager_config
-    
     yaml_output = generate_networkmanager_config()
     
     # Verify structure
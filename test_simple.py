@@ -18,7 +18,14 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
-from netplan_generator import NetplanGenerator
+import io
+import time
+from netplan_generator import NetplanGenerator, generate_networkmanager_config, parse_overrides
+
+def assert_dhcp4_false(config, kind, name):
+    """Assert that interface name in section kind has dhcp4 set to false"""
+    assert config["network"][kind][name]["dhcp4"] is False, \
+        f"{name} should have dhcp4: false when static without addresses"
 
 def test_basic_functionality():
     """Test basic functionality without external dependencies."""
@@ -32,7 +39,7 @@ def test_basic_functionality():
     
     # Test static ethernet
     print("=== Static Ethernet ===")
-    generator = NetplanGenerator()
+    generator.reset()
     generator.add_ethernet(
         "eth0", 
         dhcp4=False, 
@@ -44,13 +51,13 @@ def test_basic_functionality():
     
     # Test bond
     print("=== Bond ===")
-    generator = NetplanGenerator()
+    generator.reset()
     generator.add_bond("bond0", ["eth0", "eth1"], mode="active-backup")
     print(generator.to_yaml())
     
     # Test bridge
     print("=== Bridge ===")
-    generator = NetplanGenerator()
+    generator.reset()
     generator.add_bridge("br0", ["eth0", "eth1"])
     print(generator.to_yaml())
     
@@ -101,30 +108,141 @@ def test_static_without_addresses():
     # Test ethernet
     generator = NetplanGenerator()
     generator.add_ethernet("eth0", dhcp4=False)
-    yaml_output = generator.to_yaml()
-    assert "dhcp4: false" in yaml_output, "Ethernet should have dhcp4: false when static without addresses"
+    assert_dhcp4_false(generator.config, "ethernets", "eth0")
     print("✓ Ethernet static without addresses test passed")
     
     # Test bond
-    generator = NetplanGenerator()
+    generator.reset()
     generator.add_bond("bond0", ["eth0", "eth1"], dhcp4=False)
-    yaml_output = generator.to_yaml()
-    assert "dhcp4: false" in yaml_output, "Bond should have dhcp4: false when static without addresses"
+    assert_dhcp4_false(generator.config, "bonds", "bond0")
     print("✓ Bond static without addresses test passed")
     
     # Test bridge
-    generator = NetplanGenerator()
+    generator.reset()
     generator.add_bridge("br0", ["eth0", "eth1"], dhcp4=False)
-    yaml_output = generator.to_yaml()
-    assert "dhcp4: false" in yaml_output, "Bridge should have dhcp4: false when static without addresses"
+    assert_dhcp4_false(generator.config, "bridges", "br0")
     print("✓ Bridge static without addresses test passed")
 
+def test_yaml_cache():
+    """Test that cached YAML is refreshed after adding interfaces"""
+    print("\n=== Testing YAML Cache ===")
+    generator = NetplanGenerator()
+    generator.add_ethernet("eth0", dhcp4=True)
+    first = generator.to_yaml()
+    assert generator.to_yaml() is first, "Unchanged config should reuse cached YAML"
+    
+    generator.add_bridge("br0", ["eth1"])
+    second = generator.to_yaml()
+    assert "br0:" in second, "Cached YAML should be refreshed after add_bridge"
+    assert "br0:" not in first
+    
+    generator.reset()
+    assert "ethernets" not in generator.to_yaml(), "reset() should clear cached YAML"
+    print("✓ YAML cache test passed")
+
+def test_fast_emitter_matches_pyyaml():
+    """Test that the built-in emitter produces the same YAML as PyYAML"""
+    print("\n=== Testing Fast Emitter Parity ===")
+    generator = NetplanGenerator()
+    generator.add_ethernet(
+        "eth0",
+        dhcp4=False,
+        dhcp6=True,
+        addresses=["192.168.1.100/24", "2001:db8::10/64"],
+        gateway4="192.168.1.1",
+        gateway6="2001:db8::1",
+        nameservers=["8.8.8.8", "8.8.4.4"],
+        dhcp4_overrides={"use-dns": False, "route-metric": 100}
+    )
+    generator.add_bond("bond0", ["eth1", "eth2"], mode="802.3ad", dhcp4=False)
+    generator.add_bridge("br0", ["eth3"])
+    
+    stream = io.StringIO()
+    generator._emit(stream)
+    assert generator._emit_fast() == stream.getvalue(), "Fast emitter output should match PyYAML"
+    
+    # Values PyYAML would quote are left to PyYAML
+    generator.add_ethernet("eth4", dhcp4_overrides={"hostname": "yes"})
+    assert generator._emit_fast() is None, "Strings needing quotes should fall back to PyYAML"
+    assert "hostname: 'yes'" in generator.to_yaml()
+    
+    # So are lists shared between interfaces, which PyYAML writes as aliases
+    generator.reset()
+    addresses = ["192.168.1.100/24"]
+    generator.add_ethernet("eth0", addresses=addresses)
+    generator.add_ethernet("eth1", addresses=addresses)
+    assert generator._emit_fast() is None, "Shared lists should fall back to PyYAML"
+    assert "*id001" in generator.to_yaml()
+    
+    # ... and keys too long for PyYAML's "key:" form
+    generator.reset()
+    generator.add_ethernet("e" * 123)
+    assert generator._emit_fast() is None, "Long keys should fall back to PyYAML"
+    print("✓ Fast emitter parity test passed")
+
+def test_dump_to_stream():
+    """Test that dump_to writes the same YAML as to_yaml"""
+    print("\n=== Testing dump_to ===")
+    generator = NetplanGenerator()
+    generator.add_bond("bond0", ["eth0", "eth1"], mode="active-backup")
+    stream = io.StringIO()
+    generator.dump_to(stream)
+    assert stream.getvalue() == generator.to_yaml(), "dump_to should match to_yaml"
+    
+    # Also when PyYAML has to serialize the configuration
+    generator.add_ethernet("eth2", dhcp4_overrides={"hostname": "on"})
+    stream = io.StringIO()
+    generator.dump_to(stream)
+    assert stream.getvalue() == generator.to_yaml(), "dump_to should match to_yaml"
+    
+    # Binary streams get encoded output
+    stream = io.BytesIO()
+    generator.dump_to(stream, encoding="utf-8")
+    assert stream.getvalue() == generator.to_yaml().encode("utf-8")
+    print("✓ dump_to test passed")
+
+def test_invalid_values():
+    """Test that unknown renderers and bond modes are rejected"""
+    print("\n=== Testing Invalid Values ===")
+    for renderer in ("systemd", None):
+        try:
+            NetplanGenerator(renderer)
+            raise AssertionError(f"Renderer {renderer!r} should raise ValueError")
+        except ValueError:
+            pass
+    
+    try:
+        NetplanGenerator().add_bond("bond0", ["eth0"], mode="round-robin")
+        raise AssertionError("Unknown bond mode should raise ValueError")
+    except ValueError:
+        pass
+    print("✓ Invalid values test passed")
+
+def test_parse_overrides():
+    """Test that override keys and values are kept as typed"""
+    print("\n=== Testing Override Parsing ===")
+    overrides = parse_overrides(" use-dns = false , route-metric=-100,key with space=val")
+    assert overrides == {"use-dns": False, "route-metric": -100, "key with space": "val"}, overrides
+    
+    # Only plain signed digits become integers
+    overrides = parse_overrides("a=1_000,b=+7,c=0x10")
+    assert overrides == {"a": "1_000", "b": 7, "c": "0x10"}, overrides
+    
+    # Only the first "=" separates key and value
+    assert parse_overrides("a=b=c") == {"a": "b=c"}
+    
+    # Long whitespace-heavy pairs without "=" must not backtrack
+    start = time.perf_counter()
+    overrides = parse_overrides(" " * 20000 + "x," + "key" + " " * 20000 + "x,"
+                                + "a " * 10000 + ",k=v" + " " * 20000 + "x")
+    assert overrides == {"k": "v" + " " * 20000 + "x"}, "Malformed pairs should be skipped"
+    assert time.perf_counter() - start < 1, "Override parsing should stay linear"
+    print("✓ Override parsing test passed")
+
 def test_networkmanager_config():
     """Test NetworkManager minimal configuration generation"""
     print("\n=== Testing NetworkManager Configuration ===")
     
-    from netplan_generator import generate_networkmanager_config
-    
     yaml_output = generate_networkmanager_config()
     
     # Verify basic structure
@@ -144,4 +262,9 @@ if __name__ == "__main__":
     test_bond_ethernet_declarations()
     test_bridge_ethernet_declarations()
     test_static_without_addresses()
+    test_yaml_cache()
+    test_fast_emitter_matches_pyyaml()
+    test_dump_to_stream()
+    test_invalid_values()
+    test_parse_overrides()
     test_networkmanager_config()
\ No newline at end of file